@@ -1,12 +1,15 @@
 import asyncio
 import aiohttp
 import time
+import random
 import json
 from tqdm import tqdm
-from bs4 import BeautifulSoup
+from selectolax.lexbor import LexborHTMLParser
 import re
-import hashlib
+import logging
 import os
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 from apify_client import ApifyClient
 from apify import Actor
 
@@ -14,15 +17,168 @@ from apify import Actor
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException
+
+logger = logging.getLogger(__name__)
+
+# Patterns and selector lists are built once at import time instead of per card
+_ACTIVELY_HIRING_RE = re.compile(r'Actively\s+hiring')
+_DUR_LABEL_RE = re.compile(r'^Duration\s*:')
+_STIP_LABEL_RE = re.compile(r'^Stipend\s*:')
+_PLURAL_RE = re.compile(r'\(s\)')
+_HIRING_FLAGS_RE = re.compile(r'(?P<actively>actively\s+hiring)|(?P<early>early\s+applicant)', re.I)
+_LEADING_CLASS_RE = re.compile(r'^([a-z0-9]*)\.([\w-]+)(.*)$')
+_SLUG_TABLE = str.maketrans({'.': None, ' ': '-'})
+
+# Responses worth retrying before falling back to Selenium
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+FETCH_RETRIES = 3
+
+CARD_SELECTORS = (
+    # Standard selectors
+    ".individual_internship", ".internship_meta", ".internship-container",
+    ".container-fluid .internship_list",
+    # More specific selectors
+    ".internship_list_container .individual_internship",
+    ".internship-container .internship",
+    ".internships-list .internship-container",
+    # Generic fallback selectors
+    "div[class*='internship']", "div[class*='job']",
+    ".internship_list > div", ".internships > div",
+    # Catch-all for list items
+    ".internship-list > div", ".internship_list li", ".internships li"
+)
+
+TITLE_SELECTORS = (
+    ".job-title-href", ".profile", "h3.heading", ".view_detail_button",
+    ".view-detail", "a[title]", ".heading a", ".internship-title", ".profile"
+)
+
+COMPANY_SELECTORS = (
+    ".company-name", ".company_name", ".company_and_premium",
+    ".company-text", ".company_text", ".company"
+)
+
+LOCATION_SELECTORS = (
+    ".locations a", ".location_names", ".location_link", ".location",
+    ".location-name", ".internship_other_details_container .location_names"
+)
+
+DURATION_SELECTORS = (
+    ".ic-16-calendar + span", ".duration",
+    ".internship_other_details_container span:nth-child(1)",
+    ".other_detail_item span"
+)
+
+STIPEND_SELECTORS = (
+    ".stipend", ".stipend_container", ".internship_other_details_container span:nth-child(2)",
+    ".stipend-text", ".stipend_text"
+)
+
+EXPERIENCE_SELECTORS = (
+    ".row-1-item", ".other_detail_item", ".internship_other_details_container", ".internship-detail"
+)
+
+ACTIVELY_HIRING_SELECTORS = (
+    ".actively-hiring-badge", ".actively_hiring_badge",
+    ".actively-hiring", ".badge-actively-hiring", ".actively_hiring"
+)
+
+EARLY_APPLICANT_SELECTORS = (
+    ".early_applicant_wrapper", ".early-applicant",
+    ".early_applicant"
+)
+
+INTERNSHIP_TYPE_SELECTORS = (
+    ".gray-labels .status-li span", ".internship_label", ".label_container span",
+    ".badge-container span", ".label-container span", "span.badge"
+)
+
+POSTED_SELECTORS = (
+    ".status-inactive span", ".posted_by_container", ".posted span",
+    ".posted-by", ".posted_by", ".posted-on", ".posted_on"
+)
+
+LOGO_SELECTORS = (
+    ".internship_logo img", ".company_logo img",
+    ".logo img", ".company-logo img", ".internship-logo img"
+)
+
+LINK_SELECTORS = (
+    "a.view_detail_button", "a.apply_button",
+    "a.view-detail-button", "a.view-detail", "a.view_detail",
+    ".view-detail a", ".apply a", ".apply_now a", "a.apply_now"
+)
+
+@lru_cache(maxsize=None)
+def split_leading_class(selector):
+    """Split a selector starting with ".class" or "tag.class" into (tag, class, rest), else None"""
+    match = _LEADING_CLASS_RE.match(selector)
+    return match.groups() if match else None
+
+def normalize_whitespace(text):
+    """Collapse whitespace runs to single spaces and strip the ends"""
+    # str.split() stays in C and is faster than a regex for short strings
+    return ' '.join(text.split())
+
+def internship_key(internship):
+    """Identify an internship by (title, company, location) for duplicate checks"""
+    return (internship.get('title', ''), internship.get('company', ''), internship.get('location', ''))
+
+def looks_like_card_text(text):
+    """Whether lowercased text mentions the words an internship card's text would"""
+    return (("internship" in text or "job" in text) and
+            ("stipend" in text or "salary" in text or "month" in text) and
+            ("duration" in text or "location" in text))
+
+def card_count_settled():
+    """WebDriverWait condition that holds once two polls in a row see the same number of cards"""
+    last_count = None
+
+    def condition(driver):
+        nonlocal last_count
+        count = len(driver.find_elements(By.CSS_SELECTOR, '.individual_internship'))
+        settled = count == last_count
+        last_count = count
+        return settled
+
+    return condition
+
+def css_descendants(node, selector):
+    """Like node.css(), but leave out node itself as BeautifulSoup's select() did"""
+    root_id = node.mem_id
+    return [match for match in node.css(selector) if match.mem_id != root_id]
+
+def index_card_classes(card):
+    """Walk the card once and map each class name to its descendant nodes in document order"""
+    index = {}
+    nodes = card.traverse()
+    next(nodes, None)  # The walk starts at the card, which selectors never match
+    for node in nodes:
+        classes = node.attributes.get('class')
+        if classes:
+            for name in classes.split():
+                index.setdefault(name, []).append(node)
+    return index
 
 class ImprovedInternshalaScraperWithMaxResults:
-    def __init__(self, base_url, max_results=50, pages_to_scrape=20):
+    def __init__(self, base_url, max_results=50, pages_to_scrape=20, debug=False):
         self.base_url = base_url
+        self._base = base_url.rstrip('/')  # Canonical base that page URLs are built from
+        self.debug = debug  # Print per-page card detection details
         self.max_results = max_results
         self.pages_to_scrape = pages_to_scrape
         self.all_internships = []
-        self.visited_hashes = set()  # To track duplicates
+        self.visited_keys = set()  # (title, company, location) of seen internships
+        self._card_cache = {}  # Card HTML -> parsed internship (or None), shared by parse threads
         self.valid_internship_count = 0
+        self._parse_pool = ThreadPoolExecutor(max_workers=4)  # Runs process_html off the event loop
+        self._driver = None  # Selenium fallback driver, started lazily and reused
+        # A single worker keeps the shared driver to one page at a time
+        self._selenium_pool = ThreadPoolExecutor(max_workers=1)
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
@@ -51,7 +207,6 @@ class ImprovedInternshalaScraperWithMaxResults:
 
     def generate_urls(self):
         """Generate URLs for all pages to be scraped, limited by max_results"""
-        urls = []
         estimated_internships_per_page = 10  # Approximate number of internships per page
 
         # Calculate how many pages we need to reach max_results
@@ -60,79 +215,65 @@ class ImprovedInternshalaScraperWithMaxResults:
             max(1, (self.max_results + estimated_internships_per_page - 1) // estimated_internships_per_page)
         )
 
-        for page in range(1, required_pages + 1):
-            if page == 1:
-                urls.append(self.base_url.rstrip('/'))
-            else:
-                urls.append(f"{self.base_url.rstrip('/')}/page-{page}")
-        return urls
-
-    def generate_hash(self, internship):
-        """Generate a unique hash for an internship to detect duplicates"""
-        hash_string = f"{internship.get('title', '')}-{internship.get('company', '')}-{internship.get('location', '')}"
-        return hashlib.md5(hash_string.encode()).hexdigest()
+        # Page 1 is the bare base URL, later pages add a /page-N suffix
+        return [self._base if page == 1 else f"{self._base}/page-{page}" for page in range(1, required_pages + 1)]
 
     def parse_internship_card(self, card):
         """Extract data from a single internship card with improved parsing"""
         try:
+            # Most selectors start with a class, so answer them from a single
+            # walk of the card instead of a CSS query over the subtree each
+            class_index = index_card_classes(card)
+
+            def select(selector):
+                parts = split_leading_class(selector)
+                if parts is None:
+                    return css_descendants(card, selector)
+                tag, name, rest = parts
+                if rest:
+                    # The leading class may sit on the card or an ancestor, so
+                    # compound selectors always need a real CSS query
+                    return css_descendants(card, selector)
+                nodes = class_index.get(name)
+                if not nodes:
+                    # No descendant carries the class, so nothing can match
+                    return []
+                if tag:
+                    return [node for node in nodes if node.tag == tag]
+                return nodes
+
             # Helper function to safely extract text with better defaults
             def get_text(selector, default=None):
-                elements = card.select(selector)
-                for element in elements:
-                    if element:
-                        text = element.text.strip()
-                        # Clean up any extra whitespace and newlines
-                        text = re.sub(r'\s+', ' ', text).strip()
-                        # Only return if it has actual content
-                        if text and text != "Not specified" and len(text) > 0:
-                            # Further cleanup: check for "Actively hiring" text in company name
-                            if "Actively hiring" in text and "company" in selector:
-                                text = text.replace("Actively hiring", "").strip()
-                            return text
+                for element in select(selector):
+                    # Clean up any extra whitespace and newlines
+                    text = normalize_whitespace(element.text(deep=True))
+                    # Only return if it has actual content
+                    if text and text != "Not specified" and len(text) > 0:
+                        # Further cleanup: check for "Actively hiring" text in company name
+                        if "Actively hiring" in text and "company" in selector:
+                            text = text.replace("Actively hiring", "").strip()
+                        return text
                 return default
 
             # Helper function to safely extract attribute
             def get_attr(selector, attr, default=None):
-                elements = card.select(selector)
-                for element in elements:
-                    if element and attr in element.attrs:
-                        value = element[attr]
-                        if value and value != "Not specified" and len(value) > 0:
-                            return value
+                for element in select(selector):
+                    value = element.attributes.get(attr)
+                    if value and value != "Not specified" and len(value) > 0:
+                        return value
                 return default
 
-            # Build internship data with more robust parsing
-            internship_data = {}
-
-            # Get primary fields with multiple selectors
-            # Use broader selectors and check multiple elements
-            title_selectors = [
-                ".job-title-href", ".profile", "h3.heading", ".view_detail_button",
-                ".view-detail", "a[title]", ".heading a", ".internship-title", ".profile"
-            ]
-
-            company_selectors = [
-                ".company-name", ".company_name", ".company_and_premium",
-                ".company-text", ".company_text", ".company"
-            ]
-
-            location_selectors = [
-                ".locations a", ".location_names", ".location_link", ".location",
-                ".location-name", ".internship_other_details_container .location_names"
-            ]
-
-            # Extract text using our improved selectors
             title = None
             job_url = None
             
             # First try to get job URL from job-title-href
-            job_title_element = card.select_one(".job-title-href")
-            if job_title_element:
-                title = job_title_element.text.strip()
-                title = re.sub(r'\s+', ' ', title).strip()
+            job_title_elements = select(".job-title-href")
+            if job_title_elements:
+                job_title_element = job_title_elements[0]
+                title = normalize_whitespace(job_title_element.text(deep=True))
                 
                 # Extract href for job URL
-                href = job_title_element.get('href')
+                href = job_title_element.attributes.get('href')
                 if href:
                     # Make sure it's a full URL
                     if href.startswith('/'):
@@ -144,21 +285,21 @@ class ImprovedInternshalaScraperWithMaxResults:
             
             # If we didn't get title from job-title-href, try other selectors
             if not title:
-                for selector in title_selectors:
+                for selector in TITLE_SELECTORS:
                     title = get_text(selector, title)
                     if title:
                         break
 
             company = None
-            for selector in company_selectors:
+            for selector in COMPANY_SELECTORS:
                 company = get_text(selector, company)
                 if company:
                     # Clean up any "Actively hiring" text that might be in the company name
-                    company = re.sub(r'Actively\s+hiring', '', company).strip()
+                    company = _ACTIVELY_HIRING_RE.sub('', company).strip()
                     break
 
             location = None
-            for selector in location_selectors:
+            for selector in LOCATION_SELECTORS:
                 location = get_text(selector, location)
                 if location:
                     break
@@ -167,174 +308,93 @@ class ImprovedInternshalaScraperWithMaxResults:
             if not (title and company):
                 return None
 
-            internship_data["title"] = title
-            internship_data["company"] = company
-
-            # Add job URL and generate apply URL if we found job URL
-            if job_url:
-                internship_data["job_url"] = job_url
-                # Generate apply URL using the correct transformation
-                apply_url = self.generate_apply_url(job_url)
-                if apply_url:
-                    internship_data["apply_url"] = apply_url
-                else:
-                    # Fallback to the old method if the new pattern doesn't match
-                    internship_data["apply_url"] = f"{job_url}?amp;referral=web_share"
-
-            # Add location if available
-            if location:
-                internship_data["location"] = location
-
             # Get additional fields with improved selectors
-            duration_selectors = [
-                ".ic-16-calendar + span", ".duration",
-                ".internship_other_details_container span:nth-child(1)",
-                ".other_detail_item span", ".internship-detail span:contains('Duration')",
-                "span:contains('Duration')"
-            ]
-
-            stipend_selectors = [
-                ".stipend", ".stipend_container", ".internship_other_details_container span:nth-child(2)",
-                ".stipend-text", "span:contains('Stipend')", ".stipend_text"
-            ]
-
-            experience_selectors = [
-                ".row-1-item", ".other_detail_item", ".internship_other_details_container", ".internship-detail"
-            ]
-            # Extract other details
             duration = None
-            for selector in duration_selectors:
+            for selector in DURATION_SELECTORS:
                 duration = get_text(selector, duration)
                 if duration:
-                    # Clean up the duration text to remove any labels
-                    duration = re.sub(r'^Duration\s*:', '', duration).strip()
                     break
 
             stipend = None
-            for selector in stipend_selectors:
+            for selector in STIPEND_SELECTORS:
                 stipend = get_text(selector, stipend)
                 if stipend:
-                    # Clean up the stipend text to remove any labels
-                    stipend = re.sub(r'^Stipend\s*:', '', stipend).strip()
                     break
 
-            experience = None 
-            for selector in experience_selectors:
-                elements = card.select(selector)
-                for el in elements:
-                    icon = el.select_one("i.ic-16-briefcase")
-                    if icon:
-                        span = el.select_one("span")
-                        if span:
-                            experience = span.text.strip()
-                            # Clean up patterns like "1 year(s)" to "1 year"
-                            experience = re.sub(r'\(s\)', '', experience)
-                            experience = re.sub(r'\s+', ' ', experience).strip()
-                            break
-                if experience:
-                    break
+            # Lexbor has no :contains(), so scan the spans once for labelled values
+            if not (duration and stipend):
+                for span in css_descendants(card, "span"):
+                    span_text = normalize_whitespace(span.text(deep=True))
+                    if not duration and "Duration" in span_text:
+                        duration = span_text
+                    elif not stipend and "Stipend" in span_text:
+                        stipend = span_text
+                    if duration and stipend:
+                        break
 
-            # Add cleaned duration, stipend, and experience if available
+            # Clean up the duration and stipend text to remove any labels
             if duration:
-                internship_data["duration"] = duration
-
+                duration = _DUR_LABEL_RE.sub('', duration).strip()
             if stipend:
-                internship_data["stipend"] = stipend
-
-            if experience:
-                internship_data["experience"] = experience
-
-            # Boolean fields - check multiple class names
-            actively_hiring_selectors = [
-                ".actively-hiring-badge", ".actively_hiring_badge",
-                ".actively-hiring", "span:contains('Actively hiring')",
-                ".badge-actively-hiring", ".actively_hiring"
-            ]
-
-            early_applicant_selectors = [
-                ".early_applicant_wrapper", ".early-applicant",
-                ".early_applicant", "span:contains('Be an early applicant')"
-            ]
-
-            # Check for actively hiring badge
-            for selector in actively_hiring_selectors:
-                if card.select(selector):
-                    internship_data["actively_hiring"] = True
-                    break
-
-            # Look for text indicating "Actively hiring"
-            card_text = card.text.lower()
-            if "actively hiring" in card_text:
-                internship_data["actively_hiring"] = True
+                stipend = _STIP_LABEL_RE.sub('', stipend).strip()
 
-            # Check for early applicant badge
-            for selector in early_applicant_selectors:
-                if card.select(selector):
-                    internship_data["early_applicant"] = True
+            experience = None 
+            for selector in EXPERIENCE_SELECTORS:
+                for el in select(selector):
+                    if css_descendants(el, "i.ic-16-briefcase"):
+                        spans = css_descendants(el, "span")
+                        if spans:
+                            # Clean up patterns like "1 year(s)" to "1 year"
+                            experience = normalize_whitespace(_PLURAL_RE.sub('', spans[0].text(deep=True)))
+                            break
+                if experience:
                     break
 
-            # Look for "early applicant" text
-            if "early applicant" in card_text or "be an early applicant" in card_text:
-                internship_data["early_applicant"] = True
+            # Boolean fields - the card's own classes first, then badges inside it
+            card_classes = set((card.attributes.get('class') or '').split())
+            actively_hiring = ('actively_hiring' in card_classes or 'actively-hiring' in card_classes
+                               or any(select(selector) for selector in ACTIVELY_HIRING_SELECTORS))
+            early_applicant = ('early_applicant' in card_classes or 'early-applicant' in card_classes
+                               or any(select(selector) for selector in EARLY_APPLICANT_SELECTORS))
+
+            # Only read the card text if a badge was missing, and look for
+            # both phrases in the same pass
+            if not (actively_hiring and early_applicant):
+                for match in _HIRING_FLAGS_RE.finditer(card.text(deep=True)):
+                    if match.lastgroup == "actively":
+                        actively_hiring = True
+                    else:
+                        early_applicant = True
 
             # Add other fields if available
-            internship_type_selectors = [
-                ".gray-labels .status-li span", ".internship_label", ".label_container span",
-                ".badge-container span", ".label-container span", "span.badge"
-            ]
-
-            posted_selectors = [
-                ".status-inactive span", ".posted_by_container", ".posted span",
-                ".posted-by", ".posted_by", ".posted-on", ".posted_on"
-            ]
-
             # Get internship type
             internship_type = None
-            for selector in internship_type_selectors:
+            for selector in INTERNSHIP_TYPE_SELECTORS:
                 internship_type = get_text(selector, internship_type)
                 if internship_type:
                     break
 
-            if internship_type:
-                internship_data["type"] = internship_type
-
             # Get posted date/info
             posted = None
-            for selector in posted_selectors:
+            for selector in POSTED_SELECTORS:
                 posted = get_text(selector, posted)
                 if posted:
                     break
 
-            if posted:
-                internship_data["posted"] = posted
-
             # Get logo
-            logo_selectors = [
-                ".internship_logo img", ".company_logo img",
-                ".logo img", ".company-logo img", ".internship-logo img"
-            ]
-
             logo_url = None
-            for selector in logo_selectors:
+            for selector in LOGO_SELECTORS:
                 logo_url = get_attr(selector, "src", logo_url)
                 if logo_url:
                     break
 
-            if logo_url:
-                # Make sure it's a full URL
-                if not logo_url.startswith("http") and not logo_url.startswith("/"):
-                    logo_url = f"/{logo_url}"
-                internship_data["logo_url"] = logo_url
+            # Make sure it's a full URL
+            if logo_url and not logo_url.startswith("http") and not logo_url.startswith("/"):
+                logo_url = f"/{logo_url}"
 
             # If we didn't get job_url from job-title-href, try other link selectors
             if not job_url:
-                link_selectors = [
-                    "a.view_detail_button", "a.apply_button",
-                    "a.view-detail-button", "a.view-detail", "a.view_detail",
-                    ".view-detail a", ".apply a", ".apply_now a", "a.apply_now"
-                ]
-
-                for selector in link_selectors:
+                for selector in LINK_SELECTORS:
                     href = get_attr(selector, "href")
                     if href:
                         # Make sure it's a full URL
@@ -344,39 +404,64 @@ class ImprovedInternshalaScraperWithMaxResults:
                             job_url = f"https://internshala.com/{href}"
                         else:
                             job_url = href
-                        
-                        internship_data["job_url"] = job_url
-                        # Generate apply URL using the correct transformation
-                        apply_url = self.generate_apply_url(job_url)
-                        if apply_url:
-                            internship_data["apply_url"] = apply_url
-                        else:
-                            # Fallback to the old method if the new pattern doesn't match
-                            internship_data["apply_url"] = f"{job_url}?amp;referral=web_share"
                         break
 
-            return internship_data
+            # Generate apply URL using the correct transformation, falling back
+            # to the old method if the new pattern doesn't match
+            apply_url = None
+            if job_url:
+                apply_url = self.generate_apply_url(job_url) or f"{job_url}?amp;referral=web_share"
+
+            # Build the dict in one go from the fields that were found
+            return {key: value for key, value in (
+                ("title", title),
+                ("company", company),
+                ("job_url", job_url),
+                ("apply_url", apply_url),
+                ("location", location),
+                ("duration", duration),
+                ("stipend", stipend),
+                ("experience", experience),
+                ("actively_hiring", actively_hiring),
+                ("early_applicant", early_applicant),
+                ("type", internship_type),
+                ("posted", posted),
+                ("logo_url", logo_url),
+            ) if value}
 
         except Exception as e:
             print(f"Error parsing card: {str(e)}")
             return None
 
     async def fetch_page_async(self, session, url):
-        """Fetch a page asynchronously using aiohttp"""
-        try:
-            async with session.get(url, headers=self.headers, timeout=30) as response:
-                if response.status == 200:
-                    return await response.text()
-                else:
+        """Fetch a page asynchronously using aiohttp, retrying transient failures"""
+        for attempt in range(FETCH_RETRIES + 1):
+            try:
+                # Headers and the 30s timeout are bound on the shared session
+                async with session.get(url) as response:
+                    if response.status == 200:
+                        # Raw bytes go straight to lexbor, which reads them as
+                        # UTF-8, skipping aiohttp's charset detection and decode
+                        return await response.read()
                     print(f"Failed to fetch {url}: Status {response.status}")
-                    return None
-        except Exception as e:
-            print(f"Error fetching {url}: {str(e)}")
-            return None
+                    if response.status not in RETRY_STATUSES:
+                        return None
+            except (aiohttp.ClientConnectorError, asyncio.TimeoutError) as e:
+                print(f"Error fetching {url}: {str(e) or type(e).__name__}")
+            except Exception as e:
+                print(f"Error fetching {url}: {str(e)}")
+                return None
 
-    def scrape_page_with_selenium(self, url):
-        """Fallback method using Selenium if needed"""
-        try:
+            # Back off with jitter before retrying; Selenium is only used once these run out
+            if attempt < FETCH_RETRIES:
+                delay = 2 ** attempt + random.random()
+                print(f"Retrying {url} in {delay:.1f}s")
+                await asyncio.sleep(delay)
+        return None
+
+    def get_selenium_driver(self):
+        """Start the headless Chromium driver on first use and reuse it afterwards"""
+        if self._driver is None:
             options = Options()
             options.add_argument('--headless')
             options.add_argument('--no-sandbox')
@@ -386,67 +471,83 @@ class ImprovedInternshalaScraperWithMaxResults:
             options.binary_location = "/usr/bin/chromium"
             # Try to use default Service, fallback to chromedriver in PATH
             try:
-                driver = webdriver.Chrome(service=Service("/usr/bin/chromedriver"), options=options)
+                self._driver = webdriver.Chrome(service=Service("/usr/bin/chromedriver"), options=options)
             except Exception:
-                driver = webdriver.Chrome(options=options)  # Fallback if Service() fails
+                self._driver = webdriver.Chrome(options=options)  # Fallback if Service() fails
+        return self._driver
 
+    def scrape_page_with_selenium(self, url):
+        """Fallback method using Selenium if needed, returning UTF-8 bytes like fetch_page_async"""
+        try:
+            driver = self.get_selenium_driver()
             driver.get(url)
-            time.sleep(5)  # Wait for page to load
+            try:
+                # Wait only as long as it takes for the first card to render
+                WebDriverWait(driver, 10).until(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, '.individual_internship'))
+                )
+            except TimeoutException:
+                print(f"Timed out waiting for internship cards on {url}")
+            # Scroll to the bottom so lazily loaded cards render, then wait
+            # until the number of cards stops changing between polls
             driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(2)
-            html = driver.page_source
-            driver.quit()
-            return html
+            try:
+                WebDriverWait(driver, 5, poll_frequency=0.5).until(card_count_settled())
+            except TimeoutException:
+                print(f"Internship cards were still loading on {url}")
+            return driver.page_source.encode('utf-8')
         except Exception as e:
             print(f"Selenium error on {url}: {str(e)}")
+            # Start a fresh driver next time in case this one is broken
+            self.quit_selenium_driver()
             return None
 
+    def quit_selenium_driver(self):
+        """Quit the shared Selenium driver if one was started"""
+        if self._driver is not None:
+            try:
+                self._driver.quit()
+            except Exception:
+                pass
+            self._driver = None
+
     def process_html(self, html, url):
-        """Process HTML content and extract internships with improved selectors"""
+        """Process raw HTML bytes and extract internships with improved selectors"""
         if not html:
             return []
 
-        soup = BeautifulSoup(html, "html.parser")
-
-        # Try multiple selectors for internship cards
-        card_selectors = [
-            # Standard selectors
-            ".individual_internship", ".internship_meta", ".internship-container",
-            ".container-fluid .internship_list",
-            # More specific selectors
-            ".internship_list_container .individual_internship",
-            ".internship-container .internship",
-            ".internships-list .internship-container",
-            # Generic fallback selectors
-            "div[class*='internship']", "div[class*='job']",
-            ".internship_list > div", ".internships > div",
-            # Catch-all for list items
-            ".internship-list > div", ".internship_list li", ".internships li"
-        ]
+        tree = LexborHTMLParser(html)
 
         # Try each selector to find cards
         cards = []
-        for selector in card_selectors:
-            cards = soup.select(selector)
+        for selector in CARD_SELECTORS:
+            cards = tree.css(selector)
             if cards and len(cards) > 0:
-                print(f"Found {len(cards)} cards using selector: {selector}")
+                if self.debug:
+                    print(f"Found {len(cards)} cards using selector: {selector}")
                 break
 
         if not cards:
             # If still no cards found, try to capture any divs with specific text content
             print(f"Warning: No cards found with standard selectors on {url}")
+
+            # A div's text is part of the page's text, so if the page as a whole
+            # lacks the indicators no div can have them and the scan is skipped
+            root = tree.root
+            if root is None or not looks_like_card_text(root.text(deep=True).lower()):
+                print(f"Warning: No cards found on {url} with any detection method")
+                return []
+
             print("Trying text-based detection...")
 
-            # Look for elements likely to be internship cards based on content
-            potential_divs = soup.find_all('div')
+            # Look for elements likely to be internship cards based on content.
+            # Every div is checked: any div whose class names an internship or
+            # job already failed the selectors above, so the text is all that's left
             cards = []
 
-            for div in potential_divs:
+            for div in tree.css('div'):
                 # Check if div contains key internship indicators
-                text = div.text.lower()
-                if (("internship" in text or "job" in text) and
-                    ("stipend" in text or "salary" in text or "month" in text) and
-                    ("duration" in text or "location" in text)):
+                if looks_like_card_text(div.text(deep=True).lower()):
                     cards.append(div)
 
             if cards:
@@ -456,56 +557,84 @@ class ImprovedInternshalaScraperWithMaxResults:
                 return []
 
         # Debug output
-        print(f"Processing {len(cards)} cards from {url}")
-
-        # Process all cards on this page
+        if self.debug:
+            print(f"Processing {len(cards)} cards from {url}")
+
+        # Parse all cards on this page without touching the results, so this
+        # can run on a worker thread. Duplicates within the page are dropped
+        # here; add_internships checks the keys against earlier pages.
+        internships = []
+        page_keys = set()
         for card in cards:
+            # Cards repeated across pages have identical markup, so reuse the
+            # earlier parse. Two threads racing here just parse a card twice.
+            raw = card.html
+            if raw in self._card_cache:
+                internship_data = self._card_cache[raw]
+            else:
+                internship_data = self.parse_internship_card(card)
+                self._card_cache[raw] = internship_data
+            if not internship_data:
+                continue
+            internship_data = dict(internship_data)  # Results never alias the cached dict
+
+            key = internship_key(internship_data)
+            if key in page_keys:
+                continue
+
+            page_keys.add(key)
+            internships.append((key, internship_data))
+
+        return internships
+
+    def add_internships(self, internships):
+        """Merge (key, internship) pairs from process_html, skipping duplicates and stopping at max_results"""
+        for key, internship_data in internships:
             # Stop if we've reached max_results
             if self.valid_internship_count >= self.max_results:
                 break
 
-            internship_data = self.parse_internship_card(card)
-            if not internship_data:
+            # Check for duplicate against internships from other pages
+            if key in self.visited_keys:
                 continue
 
-            # Check for duplicate using hash
-            card_hash = self.generate_hash(internship_data)
-            if card_hash in self.visited_hashes:
-                continue
-
-            # Add the internship and its hash
-            self.visited_hashes.add(card_hash)
+            # Add the internship and its key
+            self.visited_keys.add(key)
             self.all_internships.append(internship_data)
             self.valid_internship_count += 1
 
-            # Debug output for successful extraction
-            job_url = internship_data.get('job_url', 'No URL')
-            apply_url = internship_data.get('apply_url', 'No apply URL')
-            experience = internship_data.get('experience', 'No experience specified')
-            print(f"Extracted internship: {internship_data.get('title')} at {internship_data.get('company')}")
-            print(f"  Job URL: {job_url}")
-            print(f"  Apply URL: {apply_url}")
-            print(f"  Experience: {experience}")
+            # Debug output for successful extraction, formatted only if enabled
+            logger.debug(
+                "Extracted internship: %s at %s\n  Job URL: %s\n  Apply URL: %s\n  Experience: %s",
+                internship_data.get('title'), internship_data.get('company'),
+                internship_data.get('job_url', 'No URL'),
+                internship_data.get('apply_url', 'No apply URL'),
+                internship_data.get('experience', 'No experience specified'),
+            )
 
             # Stop if we've reached max_results
             if self.valid_internship_count >= self.max_results:
                 print(f"Reached max results limit ({self.max_results})")
                 break
 
-        return []
-
-    async def scrape_page(self, url):
-        """Scrape a single page"""
+    async def scrape_page(self, session, url):
+        """Scrape a single page using the shared session"""
         try:
-            async with aiohttp.ClientSession(cookie_jar=aiohttp.DummyCookieJar()) as session:
-                html = await self.fetch_page_async(session, url)
+            html = await self.fetch_page_async(session, url)
 
-                # If aiohttp fails, fall back to Selenium
-                if not html:
-                    print(f"Falling back to Selenium for {url}")
-                    html = self.scrape_page_with_selenium(url)
+            loop = asyncio.get_running_loop()
 
-                return self.process_html(html, url)
+            # If aiohttp fails, fall back to Selenium on its own thread so the
+            # browser doesn't block the event loop
+            if not html:
+                print(f"Falling back to Selenium for {url}")
+                html = await loop.run_in_executor(self._selenium_pool, self.scrape_page_with_selenium, url)
+
+            # Parse on the pool so fetches keep running while pages are parsed;
+            # the merge happens back on the event loop thread, so it needs no lock
+            internships = await loop.run_in_executor(self._parse_pool, self.process_html, html, url)
+            self.add_internships(internships)
+            return internships
 
         except Exception as e:
             print(f"Error scraping {url}: {str(e)}")
@@ -513,55 +642,68 @@ class ImprovedInternshalaScraperWithMaxResults:
 
     async def scrape_all_pages_async(self):
         """Scrape all pages asynchronously"""
-        urls = self.generate_urls()
+        # Drop repeated URLs (keeping order) so no page is fetched twice
+        urls = list(dict.fromkeys(self.generate_urls()))
+
+        # One pooled session for every page so connections to internshala.com
+        # are kept alive instead of re-doing TCP+TLS for each URL
+        connector = aiohttp.TCPConnector(limit=32, limit_per_host=8, ttl_dns_cache=300, keepalive_timeout=30)
+        async with aiohttp.ClientSession(
+            connector=connector,
+            headers=self.headers,
+            cookie_jar=aiohttp.DummyCookieJar(),
+            timeout=aiohttp.ClientTimeout(total=30),
+        ) as session:
+            # Bound the number of pages in flight to match the per-host pool
+            sem = asyncio.Semaphore(8)
+
+            async def bounded(url):
+                async with sem:
+                    if self.valid_internship_count >= self.max_results:
+                        return []
+                    return await self.scrape_page(session, url)
 
-        # Create tasks for each URL
-        tasks = []
-        for url in urls:
-            if self.valid_internship_count >= self.max_results:
-                break
-            tasks.append(self.scrape_page(url))
+            tasks = [asyncio.create_task(bounded(url)) for url in urls]
 
-        # Process tasks as they complete
-        for task in tqdm(asyncio.as_completed(tasks), total=len(tasks), desc="Scraping pages"):
-            if self.valid_internship_count >= self.max_results:
-                break
+            with tqdm(total=len(tasks), desc="Scraping pages") as pbar:
+                def on_done(_task):
+                    pbar.update(1)
+                    # Cancel the pages still pending once we have enough results
+                    if self.valid_internship_count >= self.max_results:
+                        for task in tasks:
+                            task.cancel()
 
-            try:
-                await task  # process_html now appends directly to self.all_internships
-            except Exception as e:
-                print(f"Error in async task: {str(e)}")
+                for task in tasks:
+                    task.add_done_callback(on_done)
+
+                # Each page is merged into self.all_internships by add_internships as it finishes
+                results = await asyncio.gather(*tasks, return_exceptions=True)
+
+            for result in results:
+                if isinstance(result, Exception):
+                    print(f"Error in async task: {str(result)}")
 
         return self.all_internships
 
-    def run_scraper(self):
-        """Execute the scraping process"""
+    async def run_scraper_async(self):
+        """Execute the scraping process on the running event loop"""
         start_time = time.time()
         print(f"Starting scraper to collect up to {self.max_results} internships...")
-        # Run the async event loop
         try:
-            # Use asyncio.run if possible (Python 3.7+)
-            try:
-                self.all_internships = asyncio.run(self.scrape_all_pages_async())
-            except RuntimeError:
-                # Fallback for environments where asyncio.run() cannot be called (e.g., nested event loop)
-                loop = asyncio.get_event_loop()
-                if loop.is_closed():
-                    loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(loop)
-                self.all_internships = loop.run_until_complete(self.scrape_all_pages_async())
+            await self.scrape_all_pages_async()
         except Exception as e:
             print(f"Error in async execution: {str(e)}")
-            print("Falling back to synchronous execution...")
+            print("Falling back to sequential Selenium scraping...")
             urls = self.generate_urls()
-            self.all_internships = []
-            with tqdm(total=len(urls), desc="Scraping pages (sync fallback)") as pbar:
+            loop = asyncio.get_running_loop()
+            with tqdm(total=len(urls), desc="Scraping pages (Selenium fallback)") as pbar:
                 for url in urls:
                     if self.valid_internship_count >= self.max_results:
                         break
-                    html = self.scrape_page_with_selenium(url)
-                    results = self.process_html(html, url)
-                    self.all_internships.extend(results)
+                    # The browser runs on its own thread so it never blocks the event loop
+                    html = await loop.run_in_executor(self._selenium_pool, self.scrape_page_with_selenium, url)
+                    internships = await loop.run_in_executor(self._parse_pool, self.process_html, html, url)
+                    self.add_internships(internships)
                     pbar.update(1)
         end_time = time.time()
         print(f"Scraping completed in {end_time - start_time:.2f} seconds")
@@ -569,13 +711,20 @@ class ImprovedInternshalaScraperWithMaxResults:
         self.clean_results()
         return self.all_internships
 
+    def run_scraper(self):
+        """Execute the scraping process from code that has no event loop running"""
+        try:
+            return asyncio.run(self.run_scraper_async())
+        finally:
+            self.close()
+
     def clean_results(self):
         """Clean up the scraped data to fix any issues"""
         for internship in self.all_internships:
             # Fix company names with "Actively hiring" text
             if "company" in internship:
                 company = internship["company"]
-                company = re.sub(r'Actively\s+hiring', '', company).strip()
+                company = _ACTIVELY_HIRING_RE.sub('', company).strip()
                 internship["company"] = company
 
             # Ensure boolean fields are properly set
@@ -590,6 +739,13 @@ class ImprovedInternshalaScraperWithMaxResults:
         # This method is now unused, but kept for compatibility
         pass
 
+    def close(self):
+        """Release the worker pools and the Selenium driver"""
+        self._parse_pool.shutdown(wait=False, cancel_futures=True)
+        # Queued pages are dropped; one already in the browser has to finish before the driver can quit
+        self._selenium_pool.shutdown(wait=True, cancel_futures=True)
+        self.quit_selenium_driver()
+
 async def main():
     async with Actor:
         # Get input from Apify (expects input like { "job_category": "Data Science", "work_from_home": "yes", ... })
@@ -656,14 +812,21 @@ async def main():
 
         # Run the scraper
         scraper = ImprovedInternshalaScraperWithMaxResults(base_url=url, max_results=max_results)
-        results = scraper.run_scraper()
-        
-        # Push results to Apify
-        for internship_data in results:
-            await Actor.push_data(internship_data)
+        try:
+            # Run on the Actor's event loop; asyncio.run() can't be nested inside it
+            results = await scraper.run_scraper_async()
+            
+            # Push results to Apify
+            for internship_data in results:
+                await Actor.push_data(internship_data)
+            print(f"Pushed {len(results)} internships to the dataset")
+        finally:
+            # Always quit the shared Chromium, even if scraping or pushing failed. close()
+            # can wait on a page still loading in the browser, so keep it off the event loop
+            await asyncio.get_running_loop().run_in_executor(None, scraper.close)
 
 def slugify(text):
-    return text.lower().replace('.', '').replace(' ', '-')
+    return text.lower().translate(_SLUG_TABLE)
 
 def generate_url(job_category=None, work_from_home=None, location=None, part_time=None, stipend=None):
     # Allow passing parameters for automation/testing
@@ -672,10 +835,9 @@ def generate_url(job_category=None, work_from_home=None, location=None, part_tim
     if work_from_home is None:
         work_from_home = input("Work from home? (yes/no): ").lower()
 
+    # Location only goes into the on-site URL, so it is only asked for then
     if location is None and work_from_home == "no":
         location = input("Enter location (Delhi, Mumbai, Chennai): ").lower()
-    elif work_from_home == "yes":
-        location = ""
 
     if part_time is None:
         part_time = input("Part-time job? (yes/no): ").lower()
@@ -697,4 +859,10 @@ def generate_url(job_category=None, work_from_home=None, location=None, part_tim
 
 # Only run if this script is executed directly
 if __name__ == "__main__":
-    asyncio.run(main())
+    # uvloop is optional and only installed here, where this script owns the event loop
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(main())
+    else:
+        uvloop.run(main())